@@ -20,6 +20,9 @@ class Config():
     from.
     """
 
+    # Encoder shared by all JSON saves, JSONEncoder keeps no state between calls
+    __json_encoder = ConfigJSONEncoder(sort_keys=False, indent=2)
+
     def __init__(self):
         self.__config_files = None                # List of configuration files loaded
 
@@ -318,7 +321,25 @@ class Config():
         # Save configuration to a file
 
         config = self._save_impl()
-        Config.__save_dict_to_file(config, path, format='.json')
+        Config.save_dict(config, path)
+
+    @staticmethod
+    def save_dict(config, path, format='.json'):
+        """
+        Save a configuration dictionary, as returned by `to_dict`, to a file.
+
+        Arguments
+        ---------
+        config : dict
+            Dictionary containing the configuration.
+        path : str
+            Path to the configuration file.
+        format : str
+            File format, one of `.py`, `.json` or `.yaml`. If None, the format is
+            determined from the file extension.
+        """
+
+        Config.__save_dict_to_file(config, path, format=format)
 
     def _save_impl(self):
         """
@@ -397,17 +418,15 @@ class Config():
     @staticmethod
     def __save_dict_json(config, filename):
         # Save configuration to a JSON file with comments
+        # Encode the whole document first and write it at once instead of chunk by chunk
         with open(filename, 'w') as f:
-            json.dump(config, f,
-                      sort_keys=False,
-                      indent=2,
-                      cls=ConfigJSONEncoder)
+            f.write(Config.__json_encoder.encode(config))
 
     @staticmethod
     def __save_dict_yaml(config, filename):
-        # Save configuration to a YAML file
+        # Save configuration to a YAML file, with the faster C dumper if available
         with open(filename, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(config, f, Dumper=ConfigYAMLDumper, default_flow_style=False, sort_keys=False)
 
     #region Dictionary utilities
         
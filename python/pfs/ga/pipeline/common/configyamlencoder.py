@@ -2,11 +2,15 @@ import yaml
 import numpy as np
 from datetime import datetime, date
 
+# Use the C implementation of the emitter when PyYAML was built with libyaml
+ConfigYAMLDumper = getattr(yaml, 'CDumper', yaml.Dumper)
+
 def config_yaml_array_representer(dumper, data):
+    # Convert the whole array at once, the elements are then basic python types
     return dumper.represent_list(data.tolist())
 
 def config_yaml_scalar_representer(dumper, data):
-    return dumper.represent_scalar('tag:yaml.org,2002:float', data.item())
+    return dumper.represent_data(data.item())
 
 def config_yaml_datetime_representer(dumper, data):
     return dumper.represent_scalar('tag:yaml.org,2002:timestamp', data.isoformat())
@@ -14,7 +18,9 @@ def config_yaml_datetime_representer(dumper, data):
 def config_yaml_date_representer(dumper, data):
     return dumper.represent_scalar('tag:yaml.org,2002:timestamp', data.isoformat())
 
-yaml.add_representer(np.ndarray, config_yaml_array_representer)
-yaml.add_representer(np.generic, config_yaml_scalar_representer)
-yaml.add_representer(datetime, config_yaml_datetime_representer)
-yaml.add_representer(date, config_yaml_date_representer)
\ No newline at end of file
+# Multi-representers also match the subclasses, such as np.int64 or np.float32
+for _dumper in set([ yaml.Dumper, ConfigYAMLDumper ]):
+    yaml.add_multi_representer(np.ndarray, config_yaml_array_representer, Dumper=_dumper)
+    yaml.add_multi_representer(np.generic, config_yaml_scalar_representer, Dumper=_dumper)
+    yaml.add_representer(datetime, config_yaml_datetime_representer, Dumper=_dumper)
+    yaml.add_representer(date, config_yaml_date_representer, Dumper=_dumper)
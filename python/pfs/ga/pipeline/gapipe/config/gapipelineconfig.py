@@ -12,18 +12,20 @@ class GAPipelineConfig(PipelineConfig):
     """
 
     def __init__(self,
-                 target: GATargetConfig = GATargetConfig(),
-                 rvfit: RVFitConfig = RVFitConfig(),
-                 coadd: CoaddConfig = CoaddConfig(),
-                 chemfit: ChemfitConfig = ChemfitConfig()):
+                 target: GATargetConfig = None,
+                 rvfit: RVFitConfig = None,
+                 coadd: CoaddConfig = None,
+                 chemfit: ChemfitConfig = None):
         
         self.workdir = self._get_env('GAPIPE_WORKDIR')        # Working directory
         self.datadir = self._get_env('GAPIPE_DATADIR')        # PFS survey data directory root
         self.rerundir = self._get_env('GAPIPE_RERUNDIR')      # Path to rerun data, absolute or relative to `datadir`
         self.outdir = self._get_env('GAPIPE_OUTDIR')          # Pipeline output directory
 
+        self.io_threads = 1                                   # Number of threads to load the input products
+
         # GA target object configuration
-        self.target = target
+        self.target = target if target is not None else GATargetConfig()
 
         # TODO: need to get the photometry and priors from somewhere
 
@@ -79,13 +81,13 @@ class GAPipelineConfig(PipelineConfig):
         # Type of velocity corrections, 'barycentric' or 'heliocentric' or 'none'
         self.v_corr = 'barycentric'
         
-        self.rvfit = rvfit
+        self.rvfit = rvfit if rvfit is not None else RVFitConfig()
         self.run_rvfit = True
 
-        self.coadd = coadd
+        self.coadd = coadd if coadd is not None else CoaddConfig()
         self.run_coadd = True
 
-        self.chemfit = chemfit
+        self.chemfit = chemfit if chemfit is not None else ChemfitConfig()
         self.run_chemfit = False
         
         super().__init__()
@@ -14,13 +14,13 @@ class GATargetConfig(Config):
     def __init__(self,
                  proposalId = None,
                  targetType = None,
-                 identity: GAObjectIdentityConfig = GAObjectIdentityConfig(),
-                 observations: GAObjectObservationsConfig = GAObjectObservationsConfig()):
+                 identity: GAObjectIdentityConfig = None,
+                 observations: GAObjectObservationsConfig = None):
 
         self.proposalId = proposalId
         self.targetType = targetType
-        self.identity = identity
-        self.observations = observations
+        self.identity = identity if identity is not None else GAObjectIdentityConfig()
+        self.observations = observations if observations is not None else GAObjectObservationsConfig()
 
         super().__init__()
 
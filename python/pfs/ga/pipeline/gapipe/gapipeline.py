@@ -4,6 +4,7 @@ from datetime import datetime
 import pytz
 import numpy as np
 from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
 
 from pfs.datamodel import *
 from pfs.datamodel import PfsGAObject
@@ -323,25 +324,52 @@ class GAPipeline(Pipeline):
         if product not in self.product_cache:
             self.product_cache[product] = {}
 
-        q = 0
+        # Collect the products that are not in the cache yet, then load them, in parallel
+        # if configured so because loading is I/O bound, and update the cache from the
+        # calling thread
+        cache = self.product_cache[product]
+        load = {}
         for i, visit, identity in self.config.enumerate_visits():
             if issubclass(product, PfsFiberArray):
                 # Data product contains a single object
-                if visit not in self.product_cache[product]:
-                    self.product_cache[product][visit] = {}
+                if visit not in cache:
+                    cache[visit] = {}
                 
-                if identity.objId not in self.product_cache[product][visit]:
-                    data, id, filename = self.__repo.load_product(product, identity=identity)
-                    self.product_cache[product][visit][identity.objId] = data
-                    q += 1
+                if identity.objId not in cache[visit]:
+                    load[(visit, identity.objId)] = identity
             elif issubclass(product, (PfsFiberArraySet, PfsDesign)):
                 # Data product contains multiple objects
-                if visit not in self.product_cache[product]:
-                    data, id, filename = self.__repo.load_product(product, identity=identity)
-                    self.product_cache[product][visit] = data
-                    q += 1
+                if visit not in cache:
+                    load[(visit, None)] = identity
             else:
                 raise NotImplementedError('Product type not recognized.')
+
+        def load_product(identity):
+            data, id, filename = self.__repo.load_product(product, identity=identity)
+            return data
+
+        io_threads = self.config.io_threads if self.config.io_threads is not None else 1
+        if io_threads < 1:
+            raise PipelineError(f'Invalid number of I/O threads `{io_threads}`.')
+
+        if io_threads > 1 and len(load) > 1:
+            executor = ThreadPoolExecutor(max_workers=min(io_threads, len(load)))
+            products = executor.map(load_product, load.values())
+        else:
+            executor = None
+            products = map(load_product, load.values())
+
+        q = 0
+        try:
+            for (visit, objId), data in zip(load.keys(), products):
+                if objId is not None:
+                    cache[visit][objId] = data
+                else:
+                    cache[visit] = data
+                q += 1
+        finally:
+            if executor is not None:
+                executor.shutdown()
                
         logger.info(f'A total of {q} {product.__name__} data files loaded successfully for {self.__id}.')
 
@@ -88,21 +88,26 @@ class InitStep(PipelineStep):
         # available in the data repository. We only identify the products here,
         # do no load them.
 
+        # The product type and its cache are the same for every visit
+        cache = None
+        if context.pipeline.product_cache is not None:
+            cache = context.pipeline.product_cache.get(product)
+
+        if cache is not None:
+            if issubclass(product, PfsFiberArray):
+                # Data product contains a single object
+                single = True
+            elif issubclass(product, PfsFiberArraySet):
+                # Data product contains multiple objects
+                single = False
+            else:
+                raise NotImplementedError('Product type not recognized.')
+
         for i, visit, identity in context.config.enumerate_visits():
-            if context.pipeline.product_cache is not None and product in context.pipeline.product_cache:
-                if issubclass(product, PfsFiberArray):
-                    # Data product contains a single object
-                    if visit in context.pipeline.product_cache[product]:
-                        if identity.objId in context.pipeline.product_cache[product][visit]:
-                            # Product is already in the cache, skip
-                            continue
-                elif issubclass(product, PfsFiberArraySet):
-                    # Data product contains multiple objects
-                    if visit in context.pipeline.product_cache[product]:
-                        # Product is already in the cache, skip
-                        continue
-                else:
-                    raise NotImplementedError('Product type not recognized.')
+            if cache is not None and visit in cache:
+                if not single or identity.objId in cache[visit]:
+                    # Product is already in the cache, skip
+                    continue
                 
             # Product not found in cache of cache is empty, look up the file location
             try:
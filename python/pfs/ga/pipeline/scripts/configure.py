@@ -1,18 +1,20 @@
 #!/usr/bin/env python3
 
 import os
-import re
-from glob import glob
+import hashlib
+import threading
 from types import SimpleNamespace
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import numpy as np
 
-from pfs.datamodel import *
+from pfs.datamodel import PfsConfig, PfsSingle
 from pfs.datamodel.utils import calculatePfsVisitHash, wraparoundNVisit
 from pfs.ga.pfsspec.survey.repo import FileSystemRepo
 
 from ..common import Script, PipelineError
-from ..gapipe.config import *
+from ..gapipe.config import GAPipelineConfig, GATargetConfig, \
+    GAObjectIdentityConfig, GAObjectObservationsConfig
 from ..repo import PfsFileSystemConfig
 
 from ..setup_logger import logger
@@ -45,6 +47,35 @@ class Configure(Script):
         Output directory for the final data products.
     """
 
+    # Record layout used to sort the observations of a target by visit
+    __observations_dtype = np.dtype([
+        ('visit', 'i4'),
+        ('arm', 'U8'),
+        ('spectrograph', 'i4'),
+        ('pfsDesignId', 'u8'),
+        ('fiberId', 'i4'),
+        ('fiberStatus', 'i4'),
+        ('pfiNominal', 'f8', (2,)),
+        ('pfiCenter', 'f8', (2,)),
+        ('obsTime', 'M8[s]'),
+        ('expTime', 'f8'),
+    ])
+
+    # Minimum number of config files written by each worker process, fewer files are
+    # written in the main process because starting the workers costs more than it saves
+    __configs_per_process = 16
+
+    # Columns of the pfsConfig files used to configure the targets, these are
+    # the only ones stored in the cache
+    __pfsConfig_columns = [
+        'visit', 'pfsDesignId', 'arms',
+        'objId', 'catId', 'tract', 'patch', 'proposalId', 'targetType',
+        'spectrograph', 'fiberId', 'fiberStatus', 'pfiNominal', 'pfiCenter',
+    ]
+
+    # Version of the pfsConfig cache file format, increment when the format changes
+    __pfsConfig_cache_version = 1
+
     def __init__(self):
         super().__init__()
 
@@ -54,6 +85,10 @@ class Configure(Script):
         self.__outdir = self.get_env('GAPIPE_OUTDIR')       # Output directory for the final data products
         self.__dry_run = False          # Dry run mode
         self.__top = None               # Stop after this many objects
+        self.__io_threads = 1           # Number of threads used to load the data files
+        self.__processes = None         # Number of processes to write the config files, all cores if None
+        self.__cache_dir = None         # Directory to cache the pfsConfig columns between runs
+        self.__visit_hash_cache = {}    # nVisit and pfsVisitHash of the visit lists already seen
 
         self.__repo = self.__create_data_repo()
 
@@ -64,6 +99,9 @@ class Configure(Script):
 
         self.add_arg('--dry-run', action='store_true', help='Dry run mode')
         self.add_arg('--top', type=int, help='Stop after this many objects')
+        self.add_arg('--io-threads', type=int, help='Number of threads used to load the data files')
+        self.add_arg('--processes', type=int, help='Number of processes used to write the config files')
+        self.add_arg('--cache-dir', type=str, help='Directory to cache the pfsConfig columns between runs')
 
         # Register the identity param filters
         self.__repo.add_args(self)
@@ -112,6 +150,14 @@ class Configure(Script):
 
         self.__dry_run = self.get_arg('dry_run', args, self.__dry_run)
         self.__top = self.get_arg('top', args, self.__top)
+        self.__io_threads = self.get_arg('io_threads', args, self.__io_threads)
+        self.__processes = self.get_arg('processes', args, self.__processes)
+        self.__cache_dir = self.get_arg('cache_dir', args, self.__cache_dir)
+
+        if self.__io_threads < 1:
+            raise ValueError(f'Invalid number of I/O threads `{self.__io_threads}`.')
+        if self.__processes is not None and self.__processes < 1:
+            raise ValueError(f'Invalid number of processes `{self.__processes}`.')
 
         super()._init_from_args(args)
 
@@ -165,63 +211,178 @@ class Configure(Script):
 
         logger.info(f'Found {len(filenames)} pfsConfig files matching the filters.')
 
+        # The same catId, tract, patch etc. values appear in every pfsConfig file so
+        # remember the result of matching each value against the filters
+        filters = self.__repo.filters
+        column_filters = [ (name, getattr(filters, name), {})
+                           for name in [ 'objId', 'catId', 'tract', 'patch', 'spectrograph' ] ]
+
         # Create a dict keyed by objId and load the pfsConfig files of each visit to get the fiberId etc.
         targets = {}
-        for i, filename in enumerate(filenames):
-            pfsConfig, config_identity, _ = self.__repo.load_product(PfsConfig, filename=filename)
-            obsTime = datetime.combine(config_identity.date, datetime.min.time())
+        visits = set()
+        for pfsConfig, config_identity in self.__load_pfsConfigs(filenames):
+            obsTime = np.datetime64(config_identity.date, 's')
             expTime = np.nan
 
-            for j, objId in enumerate(pfsConfig.objId):
-                if objId != -1 \
-                    and self.__repo.filters.objId.match(objId) \
-                    and self.__repo.filters.catId.match(pfsConfig.catId[j]) \
-                    and self.__repo.filters.tract.match(pfsConfig.tract[j]) \
-                    and self.__repo.filters.patch.match(pfsConfig.patch[j]) \
-                    and self.__repo.filters.spectrograph.match(pfsConfig.spectrograph[j]) \
-                    and self.__repo.filters.arm.match(pfsConfig.arms):
-
-                    if objId not in targets:
-                        targets[objId] = GATargetConfig(
-                            identity = GAObjectIdentityConfig(
-                                catId = pfsConfig.catId[j],
-                                tract = pfsConfig.tract[j],
-                                patch = pfsConfig.patch[j],
-                                objId = objId),
-                            observations = GAObjectObservationsConfig(
-                                visit = [],
-                                arm = {},
-                                spectrograph = {},
-                                pfsDesignId = {},
-                                fiberId = {},
-                                fiberStatus = {},
-                                pfiNominal = {},
-                                pfiCenter = {},
-                                obsTime = {},
-                                expTime = {},
-                            ))
-                    
-                    target = targets[objId]
-                    target.observations.visit.append(identities.visit[i])
-
-                    self.__load_target_from_pfsConfig(target, objId, 
-                                                      pfsConfig.visit, pfsConfig, j,
-                                                      obsTime, expTime)
+            # The arms are the same for every fiber, skip the whole file if they don't match
+            if not filters.arm.match(pfsConfig.arms):
+                continue
+
+            # Evaluate the filters on entire columns and only loop over the matching fibers
+            objIds = pfsConfig.objId
+            mask = objIds != -1
+            for name, filter, cache in column_filters:
+                mask &= self.__match_array(filter, getattr(pfsConfig, name), cache)
+
+            idx = np.flatnonzero(mask)
+            if idx.size > 0:
+                visits.add(int(pfsConfig.visit))
+
+            # Key the targets by python ints rather than boxed numpy scalars
+            for j in idx:
+                objId = int(objIds[j])
+
+                target = targets.get(objId)
+                if target is None:
+                    target = targets[objId] = GATargetConfig(
+                        identity = GAObjectIdentityConfig(
+                            catId = pfsConfig.catId[j],
+                            tract = pfsConfig.tract[j],
+                            patch = pfsConfig.patch[j],
+                            objId = objId),
+                        observations = GAObjectObservationsConfig(
+                            visit = [],
+                            arm = [],
+                            spectrograph = [],
+                            pfsDesignId = [],
+                            fiberId = [],
+                            fiberStatus = [],
+                            pfiNominal = [],
+                            pfiCenter = [],
+                            obsTime = [],
+                            expTime = [],
+                        ))
+                
+                self.__load_target_from_pfsConfig(target, objId, 
+                                                  pfsConfig.visit, pfsConfig, j,
+                                                  obsTime, expTime)
 
         if len(targets) == 0:
-            return targets, filenames
+            return targets
 
         # Report some statistics in the log
-        unique_visits = np.unique(np.concatenate([ target.observations.visit for _, target in targets.items() ]))
-        logger.info(f'Targets span {len(unique_visits)} unique visits.')
+        logger.info(f'Targets span {len(visits)} unique visits.')
 
         # Update targets: sort observations and calculate nVisit and pfsVisitHash
         for _, target in targets.items():
-            self.__sort_target_observations_by_visit(target)
-            self.__update_target_identity(target)
+            visits = self.__sort_target_observations_by_visit(target)
+            self.__update_target_identity(target, visits)
 
         return targets
 
+    def __load_pfsConfigs(self, filenames):
+        """
+        Load the pfsConfig files using a pool of threads and yield the pfsConfig
+        objects and their identities in the order of the filenames.
+
+        Loading is I/O bound so the threads can wait for the file system in parallel.
+        The number of files loaded ahead of the caller is limited to keep the memory
+        usage bounded.
+        """
+
+        def load(filename):
+            if self.__cache_dir is not None:
+                return self.__load_pfsConfig_cached(filename)
+            
+            pfsConfig, identity, _ = self.__repo.load_product(PfsConfig, filename=filename)
+            return pfsConfig, identity
+
+        if self.__cache_dir is not None:
+            os.makedirs(self.__cache_dir, exist_ok=True)
+
+        with ThreadPoolExecutor(max_workers=self.__io_threads) as executor:
+            futures = deque()
+            for filename in filenames:
+                futures.append(executor.submit(load, filename))
+                if len(futures) >= 2 * self.__io_threads:
+                    yield futures.popleft().result()
+
+            while len(futures) > 0:
+                yield futures.popleft().result()
+
+    def __load_pfsConfig_cached(self, filename):
+        """
+        Load the columns of a pfsConfig file from the cache directory, or load the
+        pfsConfig file and store the columns in the cache.
+
+        The cache key is computed from the cache format version, the list of columns,
+        the path and the modification time of the file, hence a modified file is loaded
+        again and changing the columns invalidates the existing cache files. Only the
+        columns listed in `__pfsConfig_columns` are available on the returned object,
+        and only the date on the identity.
+        """
+
+        key = ':'.join([
+            str(Configure.__pfsConfig_cache_version),
+            ','.join(Configure.__pfsConfig_columns),
+            os.path.abspath(filename),
+            str(os.stat(filename).st_mtime_ns),
+        ])
+        cache_file = os.path.join(self.__cache_dir, hashlib.sha1(key.encode()).hexdigest() + '.npz')
+
+        if os.path.isfile(cache_file):
+            # Indexing with () returns the scalars as scalars and the arrays as they are
+            with np.load(cache_file, allow_pickle=False) as data:
+                pfsConfig = SimpleNamespace(**{ k: data[k][()] for k in Configure.__pfsConfig_columns })
+                identity = SimpleNamespace(date=data['date'][()])
+            return pfsConfig, identity
+
+        pfsConfig, identity, _ = self.__repo.load_product(PfsConfig, filename=filename)
+
+        columns = { k: self.__to_fixed_width(getattr(pfsConfig, k)) for k in Configure.__pfsConfig_columns }
+        columns['date'] = np.datetime64(identity.date, 's')
+
+        # Write to a temporary file first so that other processes and threads never
+        # see a partial file
+        tmp_file = f'{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_file, 'wb') as f:
+            np.savez(f, **columns)
+        os.replace(tmp_file, cache_file)
+
+        return pfsConfig, identity
+
+    def __to_fixed_width(self, values):
+        """
+        Convert a column to an array with a fixed width dtype. Object arrays, such as
+        string columns read from FITS, could only be stored by pickling them, which
+        `np.load` does not allow.
+        """
+
+        values = np.asarray(values)
+        if values.dtype == object:
+            values = np.array(values.tolist())
+            if values.dtype == object:
+                values = values.astype(str)
+        return values
+
+    def __match_array(self, filter, values, cache):
+        """
+        Evaluate a search filter on an array of values and return a boolean mask.
+
+        The filter is only evaluated once for each distinct value in the array. The
+        results are stored in `cache`, a dictionary keyed by value, which can be
+        reused across calls with the same filter.
+        """
+
+        unique, inverse = np.unique(np.asarray(values), return_inverse=True)
+        match = np.empty(unique.shape, dtype=bool)
+        for k, v in enumerate(unique):
+            m = cache.get(v)
+            if m is None:
+                m = cache[v] = filter.match(v)
+            match[k] = m
+        return match[inverse.ravel()]
+
     def __find_targets_pfsSingle(self):
         """
         Find all the pfsSingle files that match the filters and convert the object
@@ -242,12 +403,15 @@ class Configure(Script):
 
         logger.info(f'Found {len(filenames)} pfsSingle files matching the filters.')
 
-        # Create a dict keyed by objId
+        # Create a dict keyed by objId and collect the visits of each object
+        # for which a pfsSingle file exists
         targets = {}
+        target_visits = {}
         for i, filename in enumerate(filenames):
-            objId = identities.objId[i]
+            objId = int(identities.objId[i])
 
-            if objId not in targets:
+            visits = target_visits.get(objId)
+            if visits is None:
                 targets[objId] = GATargetConfig(
                     identity = GAObjectIdentityConfig(
                         catId = identities.catId[i],
@@ -256,27 +420,29 @@ class Configure(Script):
                         objId = objId),
                     observations = GAObjectObservationsConfig(
                         visit = [],
-                        arm = {},
-                        spectrograph = {},
-                        pfsDesignId = {},
-                        fiberId = {},
-                        fiberStatus = {},
-                        pfiNominal = {},
-                        pfiCenter = {},
-                        obsTime = {},
-                        expTime = {},
+                        arm = [],
+                        spectrograph = [],
+                        pfsDesignId = [],
+                        fiberId = [],
+                        fiberStatus = [],
+                        pfiNominal = [],
+                        pfiCenter = [],
+                        obsTime = [],
+                        expTime = [],
                     ))
+                visits = target_visits[objId] = set()
                 
-            targets[objId].observations.visit.append(identities.visit[i])
+            visits.add(int(identities.visit[i]))
 
         if len(targets) == 0:
             return targets, filenames
                 
         # Report some statistics in the log
-        unique_visits = np.unique(np.concatenate([ target.observations.visit for _, target in targets.items() ]))
+        unique_visits = sorted(set().union(*target_visits.values()))
         logger.info(f'Targets span {len(unique_visits)} unique visits.')
 
-        # Load the pfsConfig files of each visit to get the fiberId etc.
+        # Locate the pfsConfig files of each visit first, then load them with the I/O threads
+        config_filenames = []
         for visit in unique_visits:
             logger.info(f'Finding pfsConfig file matching the following filters:')
             logger.info(f'    visit: {visit}')
@@ -286,74 +452,91 @@ class Configure(Script):
             except FileNotFoundError:
                 raise PipelineError(f'No pfsConfig file found for visit {visit}.')
 
-            pfsConfig, config_identity, _ = self.__repo.load_product(PfsConfig, filename=filename)
-            obsTime = datetime.combine(config_identity.date, datetime.min.time())
+            config_filenames.append(filename)
+
+        # Load the pfsConfig files of each visit to get the fiberId etc.
+        target_ids = np.fromiter(targets.keys(), dtype=np.int64, count=len(targets))
+        pfsConfigs = self.__load_pfsConfigs(config_filenames)
+        for visit, (pfsConfig, config_identity) in zip(unique_visits, pfsConfigs):
+            obsTime = np.datetime64(config_identity.date, 's')
             expTime = np.nan
 
-            for i, objId in enumerate(pfsConfig.objId):
-                if objId in targets:
+            # Only look up the fibers that belong to one of the targets
+            objIds = pfsConfig.objId
+            for i in np.flatnonzero(np.isin(objIds, target_ids)):
+                objId = int(objIds[i])
+                if visit in target_visits[objId]:
                     target = targets[objId]
                     self.__load_target_from_pfsConfig(target, objId, visit, pfsConfig, i, obsTime, expTime)
 
         # Update targets: sort observations and calculate nVisit and pfsVisitHash
         for _, target in targets.items():
-            self.__sort_target_observations_by_visit(target)
-            self.__update_target_identity(target)
+            visits = self.__sort_target_observations_by_visit(target)
+            self.__update_target_identity(target, visits)
 
         return targets, filenames
     
     def __load_target_from_pfsConfig(self, target, objId, visit, pfsConfig, i, obsTime, expTime):
+        # Read each value of the fiber only once
+        proposalId = pfsConfig.proposalId[i]
+        targetType = pfsConfig.targetType[i]
+        catId = pfsConfig.catId[i]
+
         if target.proposalId is None:
-            target.proposalId = pfsConfig.proposalId[i]
-        elif target.proposalId != pfsConfig.proposalId[i]:
-            logger.warning(f'proposalId mismatch for objId {objId}: {target.proposalId} != {pfsConfig.proposalId[i]}')
+            target.proposalId = proposalId
+        elif target.proposalId != proposalId:
+            logger.warning(f'proposalId mismatch for objId {objId}: {target.proposalId} != {proposalId}')
         
         if target.targetType is None:
-            target.targetType = pfsConfig.targetType[i]
-        elif target.targetType != pfsConfig.targetType[i]:
-            logger.warning(f'targetType mismatch for objId {objId}: {target.targetType} != {pfsConfig.targetType[i]}')
-
-        if target.identity.catId != pfsConfig.catId[i]:
-            logger.warning(f'catId mismatch for objId {objId}: {target.identity.catId} != {pfsConfig.catId[i]}')
-
-        target.observations.arm[visit] = pfsConfig.arms             # TODO: Normalize order of arms?
-        target.observations.spectrograph[visit] = pfsConfig.spectrograph[i]
-        target.observations.pfsDesignId[visit] = pfsConfig.pfsDesignId
-        target.observations.fiberId[visit] = pfsConfig.fiberId[i]
-        target.observations.fiberStatus[visit] = pfsConfig.fiberStatus[i]
-        target.observations.pfiNominal[visit] = pfsConfig.pfiNominal[i]
-        target.observations.pfiCenter[visit] = pfsConfig.pfiCenter[i]
+            target.targetType = targetType
+        elif target.targetType != targetType:
+            logger.warning(f'targetType mismatch for objId {objId}: {target.targetType} != {targetType}')
+
+        if target.identity.catId != catId:
+            logger.warning(f'catId mismatch for objId {objId}: {target.identity.catId} != {catId}')
+
+        # Append the observation to the lists, they will be sorted by visit later
+        observations = target.observations
+        observations.visit.append(visit)
+        observations.arm.append(pfsConfig.arms)                     # TODO: Normalize order of arms?
+        observations.spectrograph.append(pfsConfig.spectrograph[i])
+        observations.pfsDesignId.append(pfsConfig.pfsDesignId)
+        observations.fiberId.append(pfsConfig.fiberId[i])
+        observations.fiberStatus.append(pfsConfig.fiberStatus[i])
+        observations.pfiNominal.append(pfsConfig.pfiNominal[i])
+        observations.pfiCenter.append(pfsConfig.pfiCenter[i])
         
         # TODO: update this to get exact time, not just the date
-        target.observations.obsTime[visit] = obsTime
+        observations.obsTime.append(obsTime)
 
         # TODO update this once exposure time appears in the pfsConfig file
-        target.observations.expTime[visit] = expTime
+        observations.expTime.append(expTime)
 
     def __sort_target_observations_by_visit(self, target):
-        def sort_by_visit(observations, values):
-            return np.array([ values[v] for v in observations.visit ])
-
         observations = target.observations
 
-        # Convert the dict to numpy arrays, and sort them by visit
-        idx = np.argsort(observations.visit)
-        observations.visit = np.array(observations.visit)[idx]
-
-        observations.arm = sort_by_visit(observations, observations.arm)
-        observations.spectrograph = sort_by_visit(observations, observations.spectrograph)
-        observations.pfsDesignId = sort_by_visit(observations, observations.pfsDesignId)
-        observations.fiberId = sort_by_visit(observations, observations.fiberId)
-        observations.fiberStatus = sort_by_visit(observations, observations.fiberStatus)
-        observations.pfiNominal = sort_by_visit(observations, observations.pfiNominal)
-        observations.pfiCenter = sort_by_visit(observations, observations.pfiCenter)
-        observations.obsTime = sort_by_visit(observations, observations.obsTime)
-        observations.expTime = sort_by_visit(observations, observations.expTime)
-
-    def __update_target_identity(self, target):
-        # Update the identity
-        target.identity.nVisit = wraparoundNVisit(len(target.observations.visit))
-        target.identity.pfsVisitHash = calculatePfsVisitHash(target.observations.visit)
+        # Collect the observations into a single structured array, sort it by visit
+        # and store the columns back into the configuration
+        records = np.empty(len(observations.visit), dtype=Configure.__observations_dtype)
+        for name in records.dtype.names:
+            records[name] = getattr(observations, name)
+        records.sort(order='visit', kind='stable')
+
+        for name in records.dtype.names:
+            setattr(observations, name, records[name])
+
+        return observations.visit
+
+    def __update_target_identity(self, target, visits):
+        # Update the identity from the sorted list of visits
+
+        # Objects observed on the same plates share the same list of visits
+        key = visits.tobytes()
+        identity = self.__visit_hash_cache.get(key)
+        if identity is None:
+            identity = (wraparoundNVisit(len(visits)), calculatePfsVisitHash(visits))
+            self.__visit_hash_cache[key] = identity
+        target.identity.nVisit, target.identity.pfsVisitHash = identity
     
     def __generate_config_files(self, targets):
         """
@@ -363,30 +546,76 @@ class Configure(Script):
         a separate work directory for each object to store the auxiliary files.
         """
 
-        q = 0
-        for objId in sorted(targets.keys()):
-            # Generate the config
-            config, filename = self.__create_config(targets[objId])
+        # Convert the template to a dictionary only once, the per-object
+        # configurations are shallow copies with the target updated
+        template = self.__config.to_dict()
+
+        # The directories are the same for every object, resolve them only once
+
+        # Input data directories
+        template['datadir'] = self.__repo.get_resolved_variable('datadir')
+        template['rerundir'] = self.__repo.get_resolved_variable('rerundir')
+
+        logger.debug(f'Configured data directory: {template["datadir"]}')
+        logger.debug(f'Configured rerun directory: {template["rerundir"]}')
 
-            # Save the config to a file
-            if not self.__dry_run:
-                logger.info(f'Saving configuration file `{filename}`.')
-                os.makedirs(os.path.dirname(filename), exist_ok=True)
-                self.__config.save(filename)
+        # Output
+        template['workdir'] = self.__workdir
+        template['outdir'] = self.__outdir
+
+        logger.debug(f'Configured work directory: {template["workdir"]}')
+        logger.debug(f'Configured output directory: {template["outdir"]}')
+
+        # Select the objects in the order of objId, this is what --top applies to
+        objIds = sorted(targets.keys())
+        if self.__top is not None and len(objIds) > self.__top:
+            objIds = objIds[:self.__top]
+            logger.info(f'Stopping after {len(objIds)} objects.')
+
+        # Process the selected objects in the order of the directory structure so that
+        # files sharing the same directory are written one after the other
+        def sort_key(target):
+            identity = target.identity
+            return identity.catId, identity.tract, identity.patch, identity.objId
+
+        # Generate the configs first so that the directories can be created in one pass
+        configs = []
+        for target in sorted((targets[objId] for objId in objIds), key=sort_key):
+            configs.append(self.__create_config(template, target))
+
+        # Create each output directory only once, even if it is shared by multiple objects
+        if not self.__dry_run:
+            for dir in set(os.path.dirname(filename) for _, filename in configs):
+                os.makedirs(dir, exist_ok=True)
+
+        # Save the configs to files. Serializing the configs is CPU bound so use a pool
+        # of processes, the config dictionaries only contain basic python types. Do not
+        # start more workers than there are batches of configs to write.
+        if not self.__dry_run:
+            processes = self.__processes if self.__processes is not None else os.cpu_count()
+            processes = min(processes, len(configs) // Configure.__configs_per_process)
+            if processes > 1:
+                chunksize = max(1, len(configs) // (4 * processes))
+                with ProcessPoolExecutor(max_workers=processes) as executor:
+                    for filename in executor.map(save_config_file, configs, chunksize=chunksize):
+                        logger.info(f'Saved configuration file `{filename}`.')
             else:
+                for config in configs:
+                    filename = save_config_file(config)
+                    logger.info(f'Saved configuration file `{filename}`.')
+        else:
+            for _, filename in configs:
                 logger.info(f'Skipped saving configuration file `{filename}`.')
 
-            q += 1
-            if self.__top is not None and q >= self.__top:
-                logger.info(f'Stopping after {q} objects.')
-                break
-
-    def __create_config(self, target, ext='.yaml'):
+    def __create_config(self, template, target, ext='.yaml'):
         """
-        Initialze a pipeline configuration object based on the template and the target.
+        Initialze a pipeline configuration dictionary based on the template and the target.
+
+        The template is the dictionary representation of the configuration template
+        with the directories already set, it is not modified.
         """
 
-        config = self.__config      # TODO: should we make a deep copy here?
+        config = dict(template)
 
         # Compose the directory and file names for the identity of the object
         # The file should be written somewhere under the work directory
@@ -396,28 +625,22 @@ class Configure(Script):
         # Name of the output pipeline configuration
         filename = os.path.join(dir, config_file)
 
-        # Update config with directory names
-
-        # Input data directories
-        config.datadir = self.__repo.get_resolved_variable('datadir')
-        config.rerundir = self.__repo.get_resolved_variable('rerundir')
-
-        logger.debug(f'Configured data directory for object {target.identity}: {config.datadir}')
-        logger.debug(f'Configured rerun directory for object {target.identity}: {config.rerundir}')
-
-        # Output
-        config.workdir = self.__workdir
-        config.outdir = self.__outdir
-
-        logger.debug(f'Configured work directory for object {target.identity}: {config.workdir}')
-        logger.debug(f'Configured output directory for object {target.identity}: {config.outdir}')
-
         # Update the config with the ids
 
-        config.target = target
+        config['target'] = target.to_dict()
 
         return config, filename
 
+def save_config_file(item):
+    """
+    Save a pipeline configuration dictionary to a file. Called in the worker
+    processes of `Configure`, hence defined at module level.
+    """
+
+    config, filename = item
+    GAPipelineConfig.save_dict(config, filename)
+    return filename
+
 def main():
     script = Configure()
     script.execute()
@@ -1,4 +1,5 @@
 import os
+import yaml
 import numpy as np
 from datetime import datetime, date
 from unittest import TestCase
@@ -98,6 +99,20 @@ class TestPipeline(TestCase):
         c.save('./tmp/test/config.yaml')
         c.save('./tmp/test/config.json')
 
+    def test_save_dict_yaml_numpy(self):
+        d = {
+            'visit': np.array([ 1, 2, 3 ]),
+            'objId': np.int64(4),
+            'expTime': np.float32(1.5),
+            'arm': np.str_('brn'),
+        }
+        Config.save_dict(d, './tmp/test/config_numpy.yaml', format='.yaml')
+
+        with open('./tmp/test/config_numpy.yaml') as f:
+            r = yaml.safe_load(f)
+
+        self.assertEqual(r, { 'visit': [ 1, 2, 3 ], 'objId': 4, 'expTime': 1.5, 'arm': 'brn' })
+
     def test_load(self):
         c = MainConfig()
         c.load('./data/test/config_01.yaml')
@@ -8,6 +8,17 @@ class TestPipeline(TestCase):
     def test_init(self):
         config = GAPipelineConfig()
 
+    def test_init_defaults_not_shared(self):
+        config1 = GAPipelineConfig()
+        config2 = GAPipelineConfig()
+
+        self.assertIsNot(config1.target, config2.target)
+        self.assertIsNot(config1.target.identity, config2.target.identity)
+        self.assertIsNot(config1.target.observations, config2.target.observations)
+        self.assertIsNot(config1.rvfit, config2.rvfit)
+        self.assertIsNot(config1.coadd, config2.coadd)
+        self.assertIsNot(config1.chemfit, config2.chemfit)
+
     def test_save(self):
         config = GAPipelineConfig()
         config.save('./tmp/test/pfsGAConfig.yaml')
@@ -1,14 +1,31 @@
 import os
+import threading
 from unittest import TestCase
 
 from pfs.datamodel import *
 from pfs.ga.pfsspec.survey.repo import FileSystemRepo as PfsFileSystemRepo
+from pfs.ga.pipeline.common import PipelineError
 from pfs.ga.pipeline.repo import PfsFileSystemConfig
 from pfs.ga.pipeline.gapipe import GAPipeline, GAPipelineTrace
-from pfs.ga.pipeline.gapipe.config import GAPipelineConfig
+from pfs.ga.pipeline.gapipe.config import GAPipelineConfig, GATargetConfig, \
+    GAObjectIdentityConfig, GAObjectObservationsConfig
 from pfs.ga.pipeline.gapipe.steps import *
 from tests.pipeline.gapipe.config.configs import *
 
+class StubRepo():
+    """
+    Data repo that records the loaded products instead of reading files.
+    """
+
+    def __init__(self):
+        self.loaded = []
+        self.lock = threading.Lock()
+
+    def load_product(self, product, identity=None):
+        with self.lock:
+            self.loaded.append((identity.visit, identity.objId))
+        return (product, identity.visit), identity, None
+
 class TestGAPipeline(TestCase):
     def get_test_config(self):
         config = GAPipelineConfig()
@@ -31,6 +48,57 @@ class TestGAPipeline(TestCase):
         pipeline = GAPipeline(config=config, trace=trace, repo=repo)
         return pipeline
 
+    def create_stub_pipeline(self, io_threads):
+        config = GAPipelineConfig()
+        config.io_threads = io_threads
+        config.target = GATargetConfig(
+            identity=GAObjectIdentityConfig(catId=1, tract=1, patch='1,1', objId=10),
+            observations=GAObjectObservationsConfig(visit=[ 3, 1, 2, 4 ]))
+
+        repo = StubRepo()
+        pipeline = GAPipeline(config=config, repo=repo)
+        pipeline.reset()
+        return pipeline, repo
+
+    def test_load_input_products_PfsFiberArray(self):
+        caches = []
+        for io_threads in [ 1, 4 ]:
+            pipeline, repo = self.create_stub_pipeline(io_threads)
+            pipeline.product_cache = { PfsSingle: { 2: { 10: 'cached' } } }
+
+            pipeline.load_input_products(PfsSingle)
+
+            # Products already in the cache are not loaded again
+            self.assertEqual([ (1, 10), (3, 10), (4, 10) ], sorted(repo.loaded))
+            self.assertEqual('cached', pipeline.product_cache[PfsSingle][2][10])
+            caches.append(pipeline.product_cache)
+
+        # The cache is filled the same way whether the products are loaded by threads or not
+        self.assertEqual(caches[0], caches[1])
+
+    def test_load_input_products_PfsFiberArraySet(self):
+        caches = []
+        for io_threads in [ 1, 4 ]:
+            pipeline, repo = self.create_stub_pipeline(io_threads)
+            pipeline.product_cache = { PfsMerged: { 2: 'cached' } }
+
+            # The second call finds every visit in the cache
+            pipeline.load_input_products(PfsMerged)
+            pipeline.load_input_products(PfsMerged)
+
+            # Each visit is loaded once
+            self.assertEqual([ (1, 10), (3, 10), (4, 10) ], sorted(repo.loaded))
+            self.assertEqual('cached', pipeline.product_cache[PfsMerged][2])
+            self.assertEqual((PfsMerged, 3), pipeline.product_cache[PfsMerged][3])
+            caches.append(pipeline.product_cache)
+
+        self.assertEqual(caches[0], caches[1])
+
+    def test_load_input_products_io_threads(self):
+        pipeline, repo = self.create_stub_pipeline(0)
+        self.assertRaises(PipelineError, pipeline.load_input_products, PfsMerged)
+        self.assertEqual([], repo.loaded)
+
     def test_validate_config(self):
         config = self.get_test_config()
         repo = self.get_test_repo(config)
@@ -0,0 +1,197 @@
+import os
+import shutil
+import numpy as np
+from datetime import date
+from types import SimpleNamespace
+from unittest import TestCase
+
+from pfs.datamodel.utils import calculatePfsVisitHash
+from pfs.ga.pipeline.gapipe.config import GAPipelineConfig, GATargetConfig, GAObjectIdentityConfig
+from pfs.ga.pipeline.scripts.configure import Configure
+
+class StubFilter():
+    """
+    Search filter that matches a set of values, or anything if `values` is None,
+    and counts how many times it is evaluated.
+    """
+
+    def __init__(self, values=None):
+        self.values = values
+        self.calls = 0
+
+    def match(self, value):
+        self.calls += 1
+        return self.values is None or value in self.values
+
+class StubRepo():
+    """
+    Data repo that serves in-memory pfsConfig objects instead of files.
+    """
+
+    def __init__(self, pfsConfigs, **filters):
+        self.pfsConfigs = pfsConfigs
+        self.filters = SimpleNamespace(**{
+            name: filters.get(name, StubFilter())
+            for name in [ 'visit', 'objId', 'catId', 'tract', 'patch', 'spectrograph', 'arm' ]
+        })
+        self.loaded = []
+
+    def find_product(self, product):
+        filenames = list(self.pfsConfigs.keys())
+        identities = SimpleNamespace(visit=np.array([ c.visit for c in self.pfsConfigs.values() ]))
+        return filenames, identities
+
+    def load_product(self, product, filename=None):
+        self.loaded.append(filename)
+        return self.pfsConfigs[filename], SimpleNamespace(date=date(2025, 3, 1)), filename
+
+class StubConfigRepo():
+    """
+    Data repo that lays out the config files by catId under a work directory.
+    """
+
+    def __init__(self, workdir):
+        self.workdir = workdir
+
+    def get_resolved_variable(self, name):
+        return None
+
+    def format_dir(self, product, identity):
+        return os.path.join(self.workdir, f'{identity.catId:05d}')
+
+    def format_filename(self, product, identity):
+        return f'pfsGAObject-{identity.catId:05d}-{identity.objId:016x}.yaml'
+
+def create_pfsConfig(visit, pfsDesignId, arms, objId, catId):
+    n = len(objId)
+    return SimpleNamespace(
+        visit = visit,
+        pfsDesignId = pfsDesignId,
+        arms = arms,
+        objId = np.array(objId, dtype=np.int64),
+        catId = np.array(catId, dtype=np.int32),
+        tract = np.full(n, 1, dtype=np.int32),
+        patch = np.array([ '1,1' ] * n),
+        proposalId = np.array([ 'S25A-000QN' ] * n),
+        targetType = np.full(n, 1, dtype=np.int32),
+        spectrograph = np.full(n, 3, dtype=np.int32),
+        fiberId = np.arange(n, dtype=np.int32) + visit,
+        fiberStatus = np.ones(n, dtype=np.int32),
+        pfiNominal = np.zeros((n, 2)),
+        pfiCenter = np.zeros((n, 2)),
+    )
+
+class TestConfigure(TestCase):
+    def create_test_script(self, repo):
+        script = Configure()
+        script._Configure__repo = repo
+        return script
+
+    def test_match_array(self):
+        script = self.create_test_script(None)
+        filter = StubFilter({ 1, 3 })
+        cache = {}
+
+        mask = script._Configure__match_array(filter, np.array([ 1, 2, 3, 1, 3 ]), cache)
+        np.testing.assert_array_equal(mask, [ True, False, True, True, True ])
+        self.assertEqual(3, filter.calls)
+        self.assertEqual({ 1: True, 2: False, 3: True }, cache)
+
+        # Values already in the cache are not evaluated again
+        mask = script._Configure__match_array(filter, np.array([ 3, 4 ]), cache)
+        np.testing.assert_array_equal(mask, [ True, False ])
+        self.assertEqual(4, filter.calls)
+
+    def test_find_targets_pfsConfig(self):
+        pfsDesignId_high = 2**63 + 1
+        pfsConfigs = {
+            # Files are listed out of visit order to test sorting
+            'pfsConfig-2.fits': create_pfsConfig(2, pfsDesignId_high, 'brn',
+                                                 [ 10, 11, -1, 12 ], [ 1, 1, 1, 2 ]),
+            'pfsConfig-1.fits': create_pfsConfig(1, 0x10, 'brn', [ 10, 11, 12 ], [ 1, 1, 2 ]),
+            # Rejected by the arm filter
+            'pfsConfig-3.fits': create_pfsConfig(3, 0x10, 'bmn', [ 10, 11, 12 ], [ 1, 1, 2 ]),
+        }
+        catId_filter = StubFilter({ 1 })
+        repo = StubRepo(pfsConfigs, catId=catId_filter, arm=StubFilter({ 'brn' }))
+        script = self.create_test_script(repo)
+
+        targets = script._Configure__find_targets_pfsConfig()
+
+        # objId -1 and the objects rejected by the catId filter are skipped
+        self.assertEqual({ 10, 11 }, set(targets.keys()))
+
+        # The catId filter is evaluated once per distinct value across all files
+        self.assertEqual(2, catId_filter.calls)
+
+        for objId, target in targets.items():
+            obs = target.observations
+            np.testing.assert_array_equal(obs.visit, [ 1, 2 ])
+            np.testing.assert_array_equal(obs.arm, [ 'brn', 'brn' ])
+            np.testing.assert_array_equal(obs.pfsDesignId, [ 0x10, pfsDesignId_high ])
+            self.assertEqual([ 0x10, pfsDesignId_high ], obs.pfsDesignId.tolist())
+            np.testing.assert_array_equal(obs.fiberId, [ 1 + objId - 10, 2 + objId - 10 ])
+            np.testing.assert_array_equal(obs.obsTime,
+                                          np.array([ '2025-03-01', '2025-03-01' ], dtype='M8[s]'))
+
+            self.assertEqual(2, target.identity.nVisit)
+            self.assertEqual(calculatePfsVisitHash([ 1, 2 ]), target.identity.pfsVisitHash)
+
+    def test_generate_config_files_top(self):
+        workdir = './tmp/test/configure/top'
+        script = self.create_test_script(StubConfigRepo(workdir))
+        script._Configure__config = GAPipelineConfig()
+        script._Configure__top = 2
+
+        # The directory order differs from the objId order
+        targets = {
+            objId: GATargetConfig(
+                identity=GAObjectIdentityConfig(catId=catId, tract=1, patch='1,1', objId=objId))
+            for objId, catId in [ (5, 1), (1, 3), (3, 2) ]
+        }
+        script._Configure__generate_config_files(targets)
+
+        # --top selects the objects with the lowest objIds
+        for objId, catId, exists in [ (1, 3, True), (3, 2, True), (5, 1, False) ]:
+            filename = os.path.join(workdir, f'{catId:05d}', f'pfsGAObject-{catId:05d}-{objId:016x}.yaml')
+            self.assertEqual(exists, os.path.isfile(filename))
+
+    def test_load_pfsConfig_cached(self):
+        datadir = './tmp/test/configure/data'
+        cachedir = './tmp/test/configure/cache'
+        shutil.rmtree(cachedir, ignore_errors=True)
+        os.makedirs(datadir, exist_ok=True)
+
+        filename = os.path.join(datadir, 'pfsConfig-1.fits')
+        with open(filename, 'wb'):
+            pass
+
+        # String columns read from FITS can come back as object arrays
+        pfsConfig = create_pfsConfig(1, 2**63 + 1, 'brn', [ 10, 11 ], [ 1, 1 ])
+        pfsConfig.proposalId = np.array([ 'S25A-000QN', 'S25A-001QN' ], dtype=object)
+
+        repo = StubRepo({ filename: pfsConfig })
+        script = self.create_test_script(repo)
+        script._Configure__cache_dir = cachedir
+        os.makedirs(cachedir, exist_ok=True)
+
+        # Cache miss, the file is loaded and the columns are written to the cache
+        script._Configure__load_pfsConfig_cached(filename)
+        self.assertEqual(1, len(repo.loaded))
+
+        # Cache hit, the columns are read from the cache
+        cached, identity = script._Configure__load_pfsConfig_cached(filename)
+        self.assertEqual(1, len(repo.loaded))
+        self.assertEqual(1, cached.visit)
+        self.assertEqual(2**63 + 1, int(cached.pfsDesignId))
+        self.assertEqual('brn', cached.arms)
+        np.testing.assert_array_equal(cached.objId, pfsConfig.objId)
+        np.testing.assert_array_equal(cached.proposalId, [ 'S25A-000QN', 'S25A-001QN' ])
+        np.testing.assert_array_equal(cached.pfiCenter, pfsConfig.pfiCenter)
+        self.assertEqual(np.datetime64('2025-03-01', 's'), np.datetime64(identity.date, 's'))
+
+        # Modifying the file invalidates the cache entry
+        stat = os.stat(filename)
+        os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        script._Configure__load_pfsConfig_cached(filename)
+        self.assertEqual(2, len(repo.loaded))